@@ -4,6 +4,7 @@ import sys
 
 from cli.validate import main as validate_main
 from cli.registry import main as registry_main
+from cli.catalog import main as catalog_main
 
 
 def main() -> int:
@@ -12,7 +13,8 @@ def main() -> int:
             "Usage: symantica <command> [args]\n"
             "Commands:\n"
             "  validate\n"
-            "  build-registry"
+            "  build-registry\n"
+            "  build-catalog"
         )
         return 2
 
@@ -25,6 +27,9 @@ def main() -> int:
     if cmd == "build-registry":
         return registry_main(args)
 
+    if cmd == "build-catalog":
+        return catalog_main(args)
+
     print(f"Unknown command: {cmd}")
     return 2
 
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import sys
+
+from core.compiler.catalog import write_catalog
+from core.compiler.load import load_project
+from core.compiler.validate import validate_project
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = argv or sys.argv[1:]
+
+    if not argv:
+        print("Usage: symantica build-catalog <project.yaml> [--out catalog.bin]")
+        return 2
+
+    project_path = argv[0]
+
+    out_path = None
+    if "--out" in argv:
+        idx = argv.index("--out")
+        if idx + 1 >= len(argv):
+            print("[ERROR] Missing value for --out")
+            return 2
+        out_path = argv[idx + 1]
+    out_path = out_path or "catalog.bin"
+
+    try:
+        project = load_project(project_path)
+    except Exception as e:
+        print(f"[ERROR] Failed to load project spec: {e}")
+        return 2
+
+    errors = [i for i in validate_project(project) if i.level == "ERROR"]
+    if errors:
+        for e in errors:
+            print(f"[ERROR] {e.message}\n")
+        print(f"Catalog build failed: {len(errors)} error(s).")
+        return 1
+
+    p = write_catalog(project, out_path)
+    print(f"Catalog written: {p}")
+    return 0
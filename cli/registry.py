@@ -1,70 +1,200 @@
 from __future__ import annotations
 
+import glob
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
 
+from core.compiler.cache import DEFAULT_CACHE_DIR, cache_key, load_cached, store_cached
 from core.compiler.load import load_project
-from core.compiler.registry import build_registry, write_registry
+from core.compiler.registry import build_registry, stamp_registry, write_registry_if_changed
 from core.compiler.validate import validate_project
 
 
-def main(argv: list[str] | None = None) -> int:
-    argv = argv or sys.argv[1:]
+USAGE = (
+    "Usage: symantica build-registry <project.yaml|glob>... [--out registry.json] [--lock registry.lock.json]\n"
+    "                                [--jobs N] [--cache-dir DIR] [--no-cache]\n"
+    "With several projects (or a glob), outputs are written next to each project file."
+)
 
-    if not argv:
-        print("Usage: symantica build-registry <project.yaml> [--out registry.json] [--lock registry.lock.json]")
-        return 2
+_VALUE_FLAGS = ("--out", "--lock", "--jobs", "--cache-dir")
 
-    project_path = argv[0]
 
-    out_path = None
-    lock_path = None
+@dataclass
+class BuildResult:
+    project_path: str
+    code: int  # 0 ok, 1 validation errors, 2 load failure
+    lines: List[str] = field(default_factory=list)
 
-    # minimal arg parsing
-    if "--out" in argv:
-        idx = argv.index("--out")
-        if idx + 1 >= len(argv):
-            print("[ERROR] Missing value for --out")
-            return 2
-        out_path = argv[idx + 1]
-
-    if "--lock" in argv:
-        idx = argv.index("--lock")
-        if idx + 1 >= len(argv):
-            print("[ERROR] Missing value for --lock")
-            return 2
-        lock_path = argv[idx + 1]
-
-    # Defaults: write BOTH
-    out_path = out_path or "registry.json"
-    lock_path = lock_path or "registry.lock.json"
 
-    try:
-        project = load_project(project_path)
-    except Exception as e:
-        print(f"[ERROR] Failed to load project spec: {e}")
-        return 2
+def _build_one(project_path: str, out_path: str, lock_path: str, cache_dir: Optional[str]) -> BuildResult:
+    """
+    Build (or reuse) one project's registry + lockfile.
 
-    issues = validate_project(project)
-    errors = [i for i in issues if i.level == "ERROR"]
-    warns = [i for i in issues if i.level == "WARN"]
+    Runs in a worker process in batch mode, so it returns printable lines
+    instead of printing.
+    """
+    res = BuildResult(project_path=project_path, code=0)
 
-    for w in warns:
-        print(f"[WARN] {w.message}\n")
-
-    if errors:
-        for e in errors:
-            print(f"[ERROR] {e.message}\n")
-        print(f"Registry build failed: {len(errors)} error(s), {len(warns)} warning(s).")
-        return 1
+    try:
+        spec_bytes = Path(project_path).read_bytes()
+    except OSError as e:
+        res.lines.append(f"[ERROR] Failed to load project spec: {e}")
+        res.code = 2
+        return res
+
+    key = cache_key(spec_bytes)
+    entry = load_cached(cache_dir, key) if cache_dir else None
+    cached = entry is not None
+
+    if entry is None:
+        try:
+            project = load_project(project_path)
+        except Exception as e:
+            res.lines.append(f"[ERROR] Failed to load project spec: {e}")
+            res.code = 2
+            return res
+
+        issues = validate_project(project)
+        errors = [i for i in issues if i.level == "ERROR"]
+        warns = [i for i in issues if i.level == "WARN"]
+
+        for w in warns:
+            res.lines.append(f"[WARN] {w.message}\n")
+
+        if errors:
+            for e in errors:
+                res.lines.append(f"[ERROR] {e.message}\n")
+            res.lines.append(f"Registry build failed: {len(errors)} error(s), {len(warns)} warning(s).")
+            res.code = 1
+            return res
+
+        # Build once; the timestamped artifact is the lockfile plus a stamp.
+        entry = {
+            "lock": build_registry(project, deterministic=True),
+            "warnings": [w.message for w in warns],
+        }
+        if cache_dir:
+            store_cached(cache_dir, key, entry)
+    else:
+        for w in entry.get("warnings", []):
+            res.lines.append(f"[WARN] {w}\n")
+
+    lock = entry["lock"]
 
     # Timestamped artifact (operational)
-    reg = build_registry(project, deterministic=False)
-    p1 = write_registry(reg, out_path)
+    wrote_out = write_registry_if_changed(stamp_registry(lock), out_path)
 
     # Deterministic lockfile (diff-friendly)
-    lock = build_registry(project, deterministic=True)
-    p2 = write_registry(lock, lock_path)
+    wrote_lock = write_registry_if_changed(lock, lock_path)
+
+    res.lines.append(f"Registry {'written' if wrote_out else 'unchanged'}: {out_path}")
+    res.lines.append(f"Registry lock {'written' if wrote_lock else 'unchanged'}: {lock_path}")
+    if cached:
+        res.lines.append(f"(cache hit: {key[:12]}…)")
+    return res
+
+
+def _expand(patterns: List[str]) -> Tuple[List[str], bool, List[str]]:
+    """
+    Expand glob patterns; returns (paths, any_glob, unmatched patterns).
+    Plain paths pass through.
+    """
+    paths: List[str] = []
+    unmatched: List[str] = []
+    any_glob = False
+    for p in patterns:
+        if glob.has_magic(p):
+            any_glob = True
+            matches = sorted(glob.glob(p, recursive=True))
+            if not matches:
+                unmatched.append(p)
+            paths.extend(matches)
+        else:
+            paths.append(p)
+    # de-duplicate, keep order
+    return list(dict.fromkeys(paths)), any_glob, unmatched
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = argv or sys.argv[1:]
+
+    if not argv:
+        print(USAGE)
+        return 2
+
+    # minimal arg parsing
+    opts = {}
+    positional: List[str] = []
+    no_cache = False
+    i = 0
+    while i < len(argv):
+        a = argv[i]
+        if a in _VALUE_FLAGS:
+            if i + 1 >= len(argv):
+                print(f"[ERROR] Missing value for {a}")
+                return 2
+            opts[a] = argv[i + 1]
+            i += 2
+            continue
+        if a == "--no-cache":
+            no_cache = True
+        else:
+            positional.append(a)
+        i += 1
+
+    project_paths, any_glob, unmatched = _expand(positional)
+    for pattern in unmatched:
+        print(f"[ERROR] No project files matched: {pattern}")
+    if unmatched:
+        return 2
+    if not project_paths:
+        print("[ERROR] No project files matched.")
+        return 2
+
+    batch = any_glob or len(project_paths) > 1
+    if batch and ("--out" in opts or "--lock" in opts):
+        print("[ERROR] --out/--lock can only be used with a single project.")
+        return 2
+
+    try:
+        jobs = int(opts.get("--jobs") or os.cpu_count() or 1)
+    except ValueError:
+        print(f"[ERROR] Invalid value for --jobs: {opts['--jobs']}")
+        return 2
 
-    print(f"Registry written: {p1}")
-    print(f"Registry lock written: {p2}")
-    return 0
+    cache_dir = None if no_cache else opts.get("--cache-dir", DEFAULT_CACHE_DIR)
+
+    tasks = []
+    for p in project_paths:
+        if batch:
+            # Defaults next to the project, like examples/*/registry.json
+            d = Path(p).parent
+            out_path, lock_path = str(d / "registry.json"), str(d / "registry.lock.json")
+        else:
+            # Defaults: write BOTH
+            out_path = opts.get("--out") or "registry.json"
+            lock_path = opts.get("--lock") or "registry.lock.json"
+        tasks.append((p, out_path, lock_path, cache_dir))
+
+    jobs = max(1, min(jobs, len(tasks)))
+    if jobs == 1:
+        results = [_build_one(*t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_build_one, *zip(*tasks)))
+
+    for r in results:
+        if batch:
+            print(f"== {r.project_path}")
+        for line in r.lines:
+            print(line)
+
+    if batch:
+        failed = sum(1 for r in results if r.code)
+        print(f"Built {len(results) - failed}/{len(results)} project(s).")
+
+    return max(r.code for r in results)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from core.compiler.registry import REGISTRY_SCHEMA, atomic_write
+
+
+DEFAULT_CACHE_DIR = ".symantica/cache"
+_CORE_DIR = Path(__file__).resolve().parents[1]
+
+
+def tool_version() -> Optional[str]:
+    try:
+        return version("symantica")
+    except PackageNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def build_fingerprint() -> str:
+    """
+    Identifies the build logic: registry schema, package version (if
+    installed) and a hash of every core/ source file.
+
+    The package version alone is not enough: it is fixed between releases
+    and missing when running from a checkout, so compiler edits would
+    otherwise keep hitting stale entries.
+    """
+    h = hashlib.sha256()
+    h.update(f"{REGISTRY_SCHEMA}\0{tool_version() or ''}\0".encode("utf-8"))
+    for src in sorted(_CORE_DIR.rglob("*.py")):
+        h.update(src.relative_to(_CORE_DIR).as_posix().encode("utf-8") + b"\0")
+        h.update(src.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def cache_key(spec_bytes: bytes, *, tool: Optional[str] = None) -> str:
+    """
+    Content address for a build: sha256 over the build fingerprint + raw
+    spec bytes.
+
+    Any edit to the spec file or to the compiler yields a new key, so
+    entries never need invalidating.
+    """
+    h = hashlib.sha256()
+    h.update(f"symantica {tool or build_fingerprint()}\0".encode("utf-8"))
+    h.update(spec_bytes)
+    return h.hexdigest()
+
+
+def _entry_path(cache_dir: str | Path, key: str) -> Path:
+    return Path(cache_dir) / key[:2] / f"{key}.json"
+
+
+def load_cached(cache_dir: str | Path, key: str) -> Optional[Dict[str, Any]]:
+    p = _entry_path(cache_dir, key)
+    try:
+        return json.loads(p.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached(cache_dir: str | Path, key: str, entry: Dict[str, Any]) -> Path:
+    """Store a cache entry atomically, so concurrent builders never see a partial one."""
+    data = json.dumps(entry, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return atomic_write(_entry_path(cache_dir, key), data)
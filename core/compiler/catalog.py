@@ -0,0 +1,309 @@
+"""
+Compact, read-only metric catalog.
+
+Binary layout (little-endian, every section 4-byte aligned):
+
+    header        MAGIC, n_strings, n_metrics, n_ids, n_aliases, blob_len
+    str offsets   (n_strings + 1) x u32 into the string blob
+    records       n_metrics x RECORD, sorted by metric name
+    id pool       n_ids x u32 string ids (tags/aliases lists)
+    alias index   n_aliases x (alias string id, record index), sorted by alias
+    string blob   utf-8, every distinct string stored once
+
+Strings are interned at build time, so repeated owners/tags/models cost
+one copy. Readers mmap the file and decode lazily, so forked workers share
+the same physical pages instead of each holding a ProjectSpec.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from core.compiler.registry import atomic_write
+from core.schema.project import ProjectSpec
+
+MAGIC = b"SYMCAT01"
+_NONE = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<8sIIIII")
+# name, semantic_key, type, model, format, owner, description,
+# tags_start, tags_count, aliases_start, aliases_count, sha256 digest
+_RECORD = struct.Struct("<11I32s")
+_U32 = struct.Struct("<I")
+_PAIR = struct.Struct("<II")
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+def _pad4(n: int) -> int:
+    return (n + 3) & ~3
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def intern(self, s: Optional[str]) -> int:
+        if s is None:
+            return _NONE
+        i = self.ids.get(s)
+        if i is None:
+            i = self.ids[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+
+def catalog_bytes(project: ProjectSpec) -> bytes:
+    """Serialize a ProjectSpec's metrics into the catalog format."""
+    table = _StringTable()
+    ids: List[int] = []
+    records: List[Tuple[int, ...]] = []
+    hashes: List[bytes] = []
+    aliases: List[Tuple[str, int]] = []
+
+    metrics = sorted(project.metrics, key=lambda m: m.name)
+    for idx, m in enumerate(metrics):
+        tags = sorted(m.tags)
+        alias_list = sorted(a.strip() for a in m.aliases if a.strip())
+
+        tags_start = len(ids)
+        ids.extend(table.intern(t) for t in tags)
+        aliases_start = len(ids)
+        ids.extend(table.intern(a) for a in alias_list)
+        aliases.extend((a, idx) for a in alias_list)
+
+        records.append(
+            (
+                table.intern(m.name),
+                table.intern(m.semantic_key),
+                table.intern(m.type),
+                table.intern((m.model or "").strip() or None),
+                table.intern(m.format),
+                table.intern(m.owner),
+                table.intern(m.description),
+                tags_start,
+                len(tags),
+                aliases_start,
+                len(alias_list),
+            )
+        )
+        hashes.append(bytes.fromhex(m.definition_hash()))
+
+    aliases.sort()
+
+    encoded = [s.encode("utf-8") for s in table.strings]
+    offsets = [0]
+    for b in encoded:
+        offsets.append(offsets[-1] + len(b))
+    blob = b"".join(encoded)
+
+    out = bytearray(_HEADER.pack(MAGIC, len(encoded), len(records), len(ids), len(aliases), len(blob)))
+    out += struct.pack(f"<{len(offsets)}I", *offsets)
+    for rec, h in zip(records, hashes):
+        out += _RECORD.pack(*rec, h)
+    out += struct.pack(f"<{len(ids)}I", *ids)
+    for alias, idx in aliases:
+        out += _PAIR.pack(table.ids[alias], idx)
+    out += blob
+    out += b"\0" * (_pad4(len(out)) - len(out))
+    return bytes(out)
+
+
+def write_catalog(project: ProjectSpec, out_path: str | Path) -> Path:
+    """Write the catalog atomically so workers never map a partial file."""
+    return atomic_write(out_path, catalog_bytes(project))
+
+
+class CatalogMetric:
+    """Lightweight view of one catalog record; fields decode on access."""
+
+    __slots__ = ("_catalog", "_index")
+
+    def __init__(self, catalog: "MetricCatalog", index: int):
+        self._catalog = catalog
+        self._index = index
+
+    def _field(self, i: int) -> Optional[str]:
+        return self._catalog._string(self._catalog._record(self._index)[i])
+
+    @property
+    def name(self) -> str:
+        return self._field(0) or ""
+
+    @property
+    def semantic_key(self) -> str:
+        return self._field(1) or ""
+
+    @property
+    def type(self) -> str:
+        return self._field(2) or ""
+
+    @property
+    def model(self) -> Optional[str]:
+        return self._field(3)
+
+    @property
+    def format(self) -> Optional[str]:
+        return self._field(4)
+
+    @property
+    def owner(self) -> Optional[str]:
+        return self._field(5)
+
+    @property
+    def description(self) -> Optional[str]:
+        return self._field(6)
+
+    @property
+    def tags(self) -> List[str]:
+        rec = self._catalog._record(self._index)
+        return self._catalog._id_list(rec[7], rec[8])
+
+    @property
+    def aliases(self) -> List[str]:
+        rec = self._catalog._record(self._index)
+        return self._catalog._id_list(rec[9], rec[10])
+
+    @property
+    def definition_hash(self) -> str:
+        return self._catalog._record(self._index)[11].hex()
+
+    def __repr__(self) -> str:
+        return f"CatalogMetric(name={self.name!r}, semantic_key={self.semantic_key!r})"
+
+
+class MetricCatalog:
+    """
+    Read-only metric catalog over a bytes buffer or an mmap'd file.
+
+    Lookups by name and alias are binary searches over the sorted records
+    and alias index; no per-process dicts are built.
+    """
+
+    def __init__(self, buf: Buffer):
+        if len(buf) < _HEADER.size:
+            raise ValueError("Truncated metric catalog.")
+        magic, n_strings, n_metrics, n_ids, n_aliases, blob_len = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a symantica metric catalog (bad magic).")
+
+        self._buf = buf
+        self._n_metrics = n_metrics
+        self._n_aliases = n_aliases
+        self._offsets_at = _HEADER.size
+        self._records_at = self._offsets_at + (n_strings + 1) * _U32.size
+        self._ids_at = self._records_at + n_metrics * _RECORD.size
+        self._aliases_at = self._ids_at + n_ids * _U32.size
+        self._blob_at = self._aliases_at + n_aliases * _PAIR.size
+        if self._blob_at + blob_len > len(buf):
+            raise ValueError("Truncated metric catalog.")
+
+        # Decoded strings, filled lazily and interned.
+        self._strings: List[Optional[str]] = [None] * n_strings
+
+    @classmethod
+    def from_project(cls, project: ProjectSpec) -> "MetricCatalog":
+        return cls(catalog_bytes(project))
+
+    @classmethod
+    def open(cls, path: str | Path) -> "MetricCatalog":
+        """
+        Map a catalog file read-only.
+
+        Open it before forking workers (or in each worker): the pages are
+        never written, so every process shares them via the page cache.
+        """
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise ValueError("Truncated metric catalog.")
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mm)
+        except ValueError:
+            mm.close()
+            raise
+
+    def close(self) -> None:
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+
+    def __enter__(self) -> "MetricCatalog":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # --- low-level access ---
+
+    def _string(self, sid: int) -> Optional[str]:
+        if sid == _NONE:
+            return None
+        s = self._strings[sid]
+        if s is None:
+            start, end = struct.unpack_from("<II", self._buf, self._offsets_at + sid * _U32.size)
+            raw = self._buf[self._blob_at + start : self._blob_at + end]
+            s = self._strings[sid] = sys.intern(raw.decode("utf-8"))
+        return s
+
+    def _record(self, index: int) -> Tuple:
+        return _RECORD.unpack_from(self._buf, self._records_at + index * _RECORD.size)
+
+    def _id_list(self, start: int, count: int) -> List[str]:
+        if not count:
+            return []
+        sids = struct.unpack_from(f"<{count}I", self._buf, self._ids_at + start * _U32.size)
+        return [self._string(sid) or "" for sid in sids]
+
+    def _name_at(self, index: int) -> str:
+        return self._string(_U32.unpack_from(self._buf, self._records_at + index * _RECORD.size)[0]) or ""
+
+    def _alias_at(self, index: int) -> Tuple[str, int]:
+        sid, rec = _PAIR.unpack_from(self._buf, self._aliases_at + index * _PAIR.size)
+        return self._string(sid) or "", rec
+
+    @staticmethod
+    def _search(n: int, key_at: Callable[[int], str], target: str) -> int:
+        """Leftmost index whose key is >= target (bisect over a sorted section)."""
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key_at(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    # --- public API ---
+
+    def __len__(self) -> int:
+        return self._n_metrics
+
+    def __iter__(self) -> Iterator[CatalogMetric]:
+        for i in range(self._n_metrics):
+            yield CatalogMetric(self, i)
+
+    def __contains__(self, name_or_alias: object) -> bool:
+        return isinstance(name_or_alias, str) and self.get(name_or_alias) is not None
+
+    def get(self, name_or_alias: str) -> Optional[CatalogMetric]:
+        i = self._search(self._n_metrics, self._name_at, name_or_alias)
+        if i < self._n_metrics and self._name_at(i) == name_or_alias:
+            return CatalogMetric(self, i)
+        j = self._search(self._n_aliases, lambda k: self._alias_at(k)[0], name_or_alias)
+        if j < self._n_aliases:
+            alias, rec = self._alias_at(j)
+            if alias == name_or_alias:
+                return CatalogMetric(self, rec)
+        return None
+
+    def __getitem__(self, name_or_alias: str) -> CatalogMetric:
+        m = self.get(name_or_alias)
+        if m is None:
+            raise KeyError(name_or_alias)
+        return m
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from core.schema.model import FieldRefSpec, JoinSpec, ModelSpec
+
+
+def _joins_by_name(model: ModelSpec) -> Dict[str, JoinSpec]:
+    return {j.name: j for j in model.joins}
+
+
+def field_spec(model: ModelSpec, ref: str) -> Optional[FieldRefSpec]:
+    """
+    Resolve 'dimensions.x' / 'measures.x' to its FieldRefSpec.
+
+    Returns None for raw column refs (they live on the primary table).
+    Raises KeyError for unknown fields, like a plain dict lookup would.
+    """
+    ref = (ref or "").strip()
+    if ref.startswith("dimensions."):
+        return model.dimensions[ref.split(".", 1)[1]]
+    if ref.startswith("measures."):
+        return model.measures[ref.split(".", 1)[1]]
+    return None
+
+
+def field_join(model: ModelSpec, ref: str) -> Optional[str]:
+    spec = field_spec(model, ref)
+    return spec.join if spec else None
+
+
+def join_path(model: ModelSpec, join_name: Optional[str]) -> List[JoinSpec]:
+    """
+    Joins needed to reach `join_name` from the primary table, root first.
+    """
+    if not join_name:
+        return []
+
+    by_name = _joins_by_name(model)
+    path: List[JoinSpec] = []
+    seen: Set[str] = set()
+    name: Optional[str] = join_name
+    while name:
+        if name in seen:
+            raise ValueError(f"Join cycle detected in model '{model.name}' at join '{name}'.")
+        if name not in by_name:
+            raise ValueError(f"Model '{model.name}' has no join named '{name}'.")
+        seen.add(name)
+        j = by_name[name]
+        path.append(j)
+        name = j.parent
+    path.reverse()
+    return path
+
+
+@dataclass(frozen=True)
+class JoinPlan:
+    """
+    The subset of a model's join graph a single query needs.
+
+    joins are ordered so that every join comes after its parent.
+    """
+    model: ModelSpec
+    joins: Tuple[JoinSpec, ...]
+
+    @property
+    def is_single_table(self) -> bool:
+        return not self.joins
+
+    def alias(self, join_name: Optional[str]) -> str:
+        return join_name or self.model.name
+
+    def locate(self, ref: str) -> Tuple[Optional[str], str]:
+        """(join name or None for the primary table, physical column) for a field ref."""
+        spec = field_spec(self.model, ref)
+        if spec is None:
+            return None, (ref or "").strip()
+        return spec.join, spec.column
+
+    def fans_out(self, join_name: Optional[str]) -> bool:
+        """
+        True if rows of `join_name`'s table are repeated by this plan.
+
+        That happens when:
+        - a join on the path from the primary table to `join_name` is
+          many_to_one: each joined row is repeated once per parent row
+          sharing its key (one_to_one and one_to_many joins match every
+          joined row to at most one parent row, so they don't), or
+        - the plan includes a one_to_many join that is not on that path.
+        """
+        path = join_path(self.model, join_name)
+        if any(j.relationship == "many_to_one" for j in path):
+            return True
+        on_path = {j.name for j in path}
+        return any(j.relationship == "one_to_many" and j.name not in on_path for j in self.joins)
+
+    def is_unique_key(self, join_name: Optional[str], column: str) -> bool:
+        """True if `column` uniquely identifies rows of `join_name`'s table."""
+        if not join_name:
+            return bool(self.model.primary_key) and column == self.model.primary_key
+        j = _joins_by_name(self.model)[join_name]
+        if j.relationship == "one_to_many" or len(j.keys) != 1:
+            return False
+        return column == next(iter(j.keys.values()))
+
+
+def plan_joins(model: ModelSpec, refs: Iterable[str]) -> JoinPlan:
+    """
+    Build the minimal JoinPlan covering `refs`.
+
+    - joins referenced by no field are eliminated (left joins on a
+      many_to_one/one_to_one key never change the row set, and dropping an
+      unused one_to_many join also removes its fan-out)
+    - inner joins are always kept because they filter primary rows
+    """
+    needed: Set[str] = set()
+    for ref in refs:
+        needed.update(j.name for j in join_path(model, field_join(model, ref)))
+    for j in model.joins:
+        if j.how == "inner":
+            needed.update(p.name for p in join_path(model, j.name))
+
+    depth = {j.name: len(join_path(model, j.name)) for j in model.joins if j.name in needed}
+    ordered = sorted(
+        (j for j in model.joins if j.name in needed),
+        key=lambda j: depth[j.name],
+    )
+    return JoinPlan(model=model, joins=tuple(ordered))
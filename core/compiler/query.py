@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from core.compiler.sql import compile_select_sql, metric_model, resolve_metric
+from core.schema.project import ProjectSpec
+from core.schema.query import QuerySpec
+
+Row = Dict[str, Any]
+
+# Runs one SQL statement against the warehouse and returns its rows.
+Runner = Callable[[str], Iterable[Mapping[str, Any]]]
+
+
+@dataclass
+class SubQuery:
+    """One warehouse statement: a set of metrics of one model at one shape."""
+    model: str
+    metrics: List[str]  # canonical metric names, also the SQL column names
+    keys: Tuple[str, ...]  # grouping columns used to merge results
+    sql: str = ""
+
+
+@dataclass
+class QueryPart:
+    subquery: int  # index into QueryPlan.subqueries
+    columns: List[Tuple[str, str]]  # (canonical metric name, requested name)
+
+
+@dataclass
+class QueryPlan:
+    """
+    Resolved batch of semantic queries.
+
+    subqueries are unique across the whole batch: requests with the same
+    model, dimensions, grain, filters and window share one statement whose
+    metric list is the union of what they asked for.
+    """
+    queries: List[QuerySpec]
+    subqueries: List[SubQuery] = field(default_factory=list)
+    parts: List[List[QueryPart]] = field(default_factory=list)
+
+
+def _order_by(q: QuerySpec) -> List[Tuple[str, bool]]:
+    return [(o[1:], True) if o.startswith("-") else (o, False) for o in q.order_by]
+
+
+def _shape_key(model: str, q: QuerySpec) -> Tuple[Any, ...]:
+    filters = tuple(
+        (f.dimension, f.op, json.dumps(f.value, sort_keys=True, default=str)) for f in q.filters
+    )
+    return (model, tuple(q.dimensions), q.grain, filters, q.days)
+
+
+def _keys(q: QuerySpec) -> Tuple[str, ...]:
+    return (("date",) if q.grain else ()) + tuple(q.dimensions)
+
+
+def plan_queries(project: ProjectSpec, queries: Sequence[QuerySpec]) -> QueryPlan:
+    """
+    Resolve semantic queries into the minimum set of warehouse statements.
+
+    Each query needs one statement per model its metrics live on; queries
+    with the same model, dimensions, grain, filters and window share it
+    regardless of ordering or limit. order_by/limit are pushed into SQL
+    only when a statement serves a single single-model request; otherwise
+    they are applied after merging.
+    """
+    plan = QueryPlan(queries=list(queries))
+    by_shape: Dict[Tuple[Any, ...], int] = {}
+
+    for q in plan.queries:
+        # model -> [(canonical, requested)], in request order
+        by_model: Dict[str, List[Tuple[str, str]]] = {}
+        for requested in q.metrics:
+            m = resolve_metric(project, requested)
+            model = metric_model(project, m)
+            if model.name not in by_model:
+                needed = list(q.dimensions) + [f.dimension for f in q.filters]
+                for d in needed:
+                    if d not in model.dimensions:
+                        raise ValueError(
+                            f"Dimension '{d}' is not defined in model '{model.name}' (needed by metric '{requested}').\n"
+                            f"Defined dimensions: {sorted(model.dimensions.keys())}"
+                        )
+            by_model.setdefault(model.name, []).append((m.name, requested))
+
+        keys = _keys(q)
+        dupes = sorted({k for k in keys if keys.count(k) > 1})
+        if dupes:
+            raise ValueError(f"Grouping columns {dupes} appear more than once (a dimension named 'date' clashes with grain).")
+
+        # Both the requested names (merged rows) and canonical names (SQL
+        # columns) must stay distinct from the grouping columns.
+        outputs = list(q.metrics)
+        canonical = [c for columns in by_model.values() for c, _ in columns]
+        clash = (set(outputs) | set(canonical)) & set(keys)
+        if clash:
+            raise ValueError(f"Metric names {sorted(clash)} collide with grouping columns {list(keys)}.")
+
+        valid_order = set(outputs) | set(keys)
+        for col, _ in _order_by(q):
+            if col not in valid_order:
+                raise ValueError(f"Cannot order by '{col}': not a requested metric, dimension or date.")
+
+        parts: List[QueryPart] = []
+        for model_name, columns in by_model.items():
+            shape = _shape_key(model_name, q)
+            idx = by_shape.get(shape)
+            if idx is None:
+                idx = len(plan.subqueries)
+                by_shape[shape] = idx
+                plan.subqueries.append(SubQuery(model=model_name, metrics=[], keys=_keys(q)))
+            sub = plan.subqueries[idx]
+            for canonical, _ in columns:
+                if canonical not in sub.metrics:
+                    sub.metrics.append(canonical)
+            parts.append(QueryPart(subquery=idx, columns=columns))
+        plan.parts.append(parts)
+
+    users = [0] * len(plan.subqueries)
+    for parts in plan.parts:
+        for part in parts:
+            users[part.subquery] += 1
+
+    # Compile once every request has contributed its metrics.
+    compiled = [False] * len(plan.subqueries)
+    for q, parts in zip(plan.queries, plan.parts):
+        for part in parts:
+            if compiled[part.subquery]:
+                continue
+            sub = plan.subqueries[part.subquery]
+            order_by: List[Tuple[str, bool]] = []
+            limit = None
+            if len(parts) == 1 and users[part.subquery] == 1:
+                requested_to_canonical = {r: c for c, r in part.columns}
+                order_by = [(requested_to_canonical.get(c, c), d) for c, d in _order_by(q)]
+                limit = q.limit
+                if limit is not None and not order_by:
+                    # Same default ordering execute_plan applies, so LIMIT
+                    # keeps a deterministic set of groups.
+                    order_by = [(c, False) for c in sub.keys]
+            sub.sql = compile_select_sql(
+                project,
+                [resolve_metric(project, name) for name in sub.metrics],
+                dims=q.dimensions,
+                grain=q.grain,
+                filters=q.filters,
+                days=q.days,
+                order_by=order_by,
+                limit=limit,
+            )
+            compiled[part.subquery] = True
+
+    return plan
+
+
+def plan_query(project: ProjectSpec, query: QuerySpec) -> QueryPlan:
+    return plan_queries(project, [query])
+
+
+def _sort_rows(rows: List[Row], order_by: Sequence[Tuple[str, bool]]) -> List[Row]:
+    # Stable multi-key sort, last key first; NULLs always sort last.
+    for col, desc in reversed(order_by):
+        present = [r for r in rows if r.get(col) is not None]
+        missing = [r for r in rows if r.get(col) is None]
+        rows = sorted(present, key=lambda r: r[col], reverse=desc) + missing
+    return rows
+
+
+def execute_plan(plan: QueryPlan, run: Runner) -> List[List[Row]]:
+    """
+    Run each unique statement once and merge results per request.
+
+    Rows from different models are outer-joined on the grouping columns;
+    metrics a model produced no row for are None.
+    """
+    results: List[List[Row]] = [[dict(r) for r in run(sub.sql)] for sub in plan.subqueries]
+
+    out: List[List[Row]] = []
+    for q, parts in zip(plan.queries, plan.parts):
+        keys = _keys(q)
+        merged: Dict[Tuple[Any, ...], Row] = {}
+        for part in parts:
+            for r in results[part.subquery]:
+                k = tuple(r.get(c) for c in keys)
+                target = merged.setdefault(k, {c: r.get(c) for c in keys})
+                for canonical, requested in part.columns:
+                    target[requested] = r.get(canonical)
+
+        rows = list(merged.values())
+        for r in rows:
+            for requested in q.metrics:
+                r.setdefault(requested, None)
+
+        order_by = _order_by(q) or [(c, False) for c in keys]
+        rows = _sort_rows(rows, order_by)
+        if q.limit is not None:
+            rows = rows[: q.limit]
+        out.append(rows)
+    return out
+
+
+def run_queries(project: ProjectSpec, queries: Sequence[QuerySpec], run: Runner) -> List[List[Row]]:
+    return execute_plan(plan_queries(project, queries), run)
+
+
+def run_query(project: ProjectSpec, query: QuerySpec, run: Runner) -> List[Row]:
+    return run_queries(project, [query], run)[0]
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+import os
+import tempfile
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -7,6 +10,8 @@ from typing import Any, Dict, List, Optional
 
 from core.schema.project import ProjectSpec
 
+REGISTRY_SCHEMA = "symantica.registry.v1"
+
 
 @dataclass(frozen=True)
 class RegistryMetric:
@@ -51,7 +56,7 @@ def build_registry(project: ProjectSpec, *, deterministic: bool) -> Dict[str, An
     metrics_sorted = sorted(metrics, key=lambda x: (x.semantic_key, x.name))
 
     artifact: Dict[str, Any] = {
-        "schema": "symantica.registry.v1",
+        "schema": REGISTRY_SCHEMA,
         "dataset": {
             "name": project.dataset.name,
             "table": project.dataset.table,
@@ -62,15 +67,72 @@ def build_registry(project: ProjectSpec, *, deterministic: bool) -> Dict[str, An
     }
 
     if not deterministic:
-        artifact["generated_at_utc"] = datetime.now(timezone.utc).isoformat()
+        return stamp_registry(artifact)
 
     return artifact
 
 
-def write_registry(registry: Dict[str, Any], out_path: str | Path) -> Path:
-    import json
+def stamp_registry(registry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Timestamped copy of a deterministic registry.
+
+    Lets callers build once and derive both artifacts from the same result.
+    """
+    artifact = dict(registry)
+    artifact["generated_at_utc"] = datetime.now(timezone.utc).isoformat()
+    return artifact
 
+
+def render_registry(registry: Dict[str, Any]) -> str:
+    return json.dumps(registry, indent=2, sort_keys=True) + "\n"
+
+
+def atomic_write(out_path: str | Path, data: bytes) -> Path:
+    """
+    Write `data` to a temp file beside `out_path` and rename it into place.
+
+    Readers (and concurrent writers) see either the old file or the new
+    one, never a partial write. The file is made world-readable (0644;
+    mkstemp creates 0600) because artifacts are shared across users.
+    """
     p = Path(out_path)
     p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(json.dumps(registry, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    fd, tmp = tempfile.mkstemp(dir=p.parent, prefix=".tmp-", suffix=p.suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, p)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
     return p
+
+
+def write_registry(registry: Dict[str, Any], out_path: str | Path) -> Path:
+    return atomic_write(out_path, render_registry(registry).encode("utf-8"))
+
+
+def write_registry_if_changed(registry: Dict[str, Any], out_path: str | Path) -> bool:
+    """
+    Write the registry unless the file already holds the same contents.
+
+    generated_at_utc is ignored in the comparison, so re-stamping an
+    otherwise unchanged registry does not touch the file (or its mtime).
+    Returns True if the file was written.
+    """
+    p = Path(out_path)
+    if p.exists():
+        try:
+            existing = json.loads(p.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            existing = None
+        if isinstance(existing, dict) and _without_stamp(existing) == _without_stamp(registry):
+            return False
+    write_registry(registry, p)
+    return True
+
+
+def _without_stamp(registry: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in registry.items() if k != "generated_at_utc"}
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
-from typing import Dict, Optional
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from core.compiler.joins import JoinPlan, plan_joins
 from core.schema.project import ProjectSpec
 from core.schema.metric import MetricSpec
+from core.schema.model import ModelSpec
+from core.schema.query import FilterSpec
 
 
-_GRAIN_TO_BQ = {"day": "DAY", "week": "WEEK", "month": "MONTH"}
+_GRAIN_TO_BQ = {"day": "DAY", "week": "WEEK", "month": "MONTH", "quarter": "QUARTER", "year": "YEAR"}
+
+_FILTER_OPS = {"eq": "=", "ne": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
 
 
 def _bq_ident(s: str) -> str:
@@ -20,7 +26,22 @@ def _metric_map(project: ProjectSpec) -> Dict[str, MetricSpec]:
     return {m.name: m for m in project.metrics}
 
 
-def _get_model(project: ProjectSpec, model_name: Optional[str]):
+def resolve_metric(project: ProjectSpec, name_or_alias: str) -> MetricSpec:
+    """Look up a metric by name, falling back to aliases."""
+    mm = _metric_map(project)
+    if name_or_alias in mm:
+        return mm[name_or_alias]
+    for m in project.metrics:
+        if name_or_alias in m.aliases:
+            return m
+    raise ValueError(f"Unknown metric '{name_or_alias}'.")
+
+
+def metric_model(project: ProjectSpec, metric: MetricSpec) -> ModelSpec:
+    return _get_model(project, metric.model)
+
+
+def _get_model(project: ProjectSpec, model_name: Optional[str]) -> ModelSpec:
     name = (model_name or "").strip() or project.dataset.name
     for m in project.models:
         if m.name == name:
@@ -28,68 +49,127 @@ def _get_model(project: ProjectSpec, model_name: Optional[str]):
     raise ValueError(f"Unknown model '{name}'.")
 
 
-def _field_sql(project: ProjectSpec, metric: MetricSpec, ref: str) -> str:
+def _metric_refs(project: ProjectSpec, metric: MetricSpec) -> List[str]:
+    """Field refs a metric reads, following ratio numerator/denominator."""
+    if metric.type == "ratio":
+        num = resolve_metric(project, metric.numerator)
+        den = resolve_metric(project, metric.denominator)
+        return _metric_refs(project, num) + _metric_refs(project, den)
+    return [metric.expr] if metric.expr else []
+
+
+def _plan(project: ProjectSpec, metric: MetricSpec, dims: Sequence[str] = ()) -> JoinPlan:
     model = _get_model(project, metric.model)
-    ref = (ref or "").strip()
-    if ref.startswith("dimensions."):
-        key = ref.split(".", 1)[1]
-        return _bq_ident(model.dimensions[key].column)
-    if ref.startswith("measures."):
-        key = ref.split(".", 1)[1]
-        return _bq_ident(model.measures[key].column)
-    return _bq_ident(ref)
+    refs = _metric_refs(project, metric) + [f"dimensions.{d}" for d in dims]
+    return plan_joins(model, refs)
+
+
+def _column_sql(plan: JoinPlan, join_name: Optional[str], column: str) -> str:
+    if plan.is_single_table:
+        return _bq_ident(column)
+    return f"{_bq_ident(plan.alias(join_name))}.{_bq_ident(column)}"
+
 
+def _field_sql(plan: JoinPlan, ref: str) -> str:
+    join_name, column = plan.locate(ref)
+    return _column_sql(plan, join_name, column)
 
-def _agg_expr(project: ProjectSpec, metric: MetricSpec) -> str:
+
+def _from_sql(plan: JoinPlan) -> str:
+    model = plan.model
+    if plan.is_single_table:
+        return _bq_ident(model.primary_table)
+
+    lines = [f"{_bq_ident(model.primary_table)} AS {_bq_ident(plan.alias(None))}"]
+    for j in plan.joins:
+        on = " AND ".join(
+            f"{_column_sql(plan, j.parent, left)} = {_column_sql(plan, j.name, right)}"
+            for left, right in j.keys.items()
+        )
+        lines.append(f"{j.how.upper()} JOIN {_bq_ident(j.table)} AS {_bq_ident(j.name)} ON {on}")
+    return "\n".join(lines)
+
+
+def _fanout_safe_field(plan: JoinPlan, metric: MetricSpec) -> Tuple[str, bool]:
+    """
+    Field SQL for an aggregate, plus whether rows must be de-duplicated.
+
+    If the plan repeats rows of the field's table (it sits on the "one"
+    side of a many_to_one join, or a one_to_many join hangs off another
+    branch), SUM/AVG would double count and are rejected. COUNT is
+    rewritten to COUNT(DISTINCT ...) when it counts the table's unique key.
+    """
+    ref = metric.expr or ""
+    join_name, column = plan.locate(ref)
+    if not plan.fans_out(join_name):
+        return _field_sql(plan, ref), False
+    if metric.type == "count" and plan.is_unique_key(join_name, column):
+        return _field_sql(plan, ref), True
+    if metric.type == "distinct_count":
+        return _field_sql(plan, ref), False
+    raise ValueError(
+        f"Metric '{metric.name}' ({metric.type} of '{ref}') would be double counted: "
+        f"the joins in model '{plan.model.name}' repeat the rows of its table. "
+        "Define it on a model whose primary table holds that field, or drop the fanning-out dimension."
+    )
+
+
+def _agg_expr(project: ProjectSpec, plan: JoinPlan, metric: MetricSpec) -> str:
     t = metric.type
+    if t == "ratio":
+        num = resolve_metric(project, metric.numerator)
+        den = resolve_metric(project, metric.denominator)
+        return f"SAFE_DIVIDE({_agg_expr(project, plan, num)}, NULLIF({_agg_expr(project, plan, den)}, 0))"
+    if t not in ("count", "distinct_count", "sum", "avg"):
+        raise ValueError(f"Unsupported metric type '{t}'.")
+
+    field, dedupe = _fanout_safe_field(plan, metric)
     if t == "count":
-        return f"COUNT({_field_sql(project, metric, metric.expr or '')})"
+        return f"COUNT(DISTINCT {field})" if dedupe else f"COUNT({field})"
     if t == "distinct_count":
-        return f"COUNT(DISTINCT {_field_sql(project, metric, metric.expr or '')})"
+        return f"COUNT(DISTINCT {field})"
     if t == "sum":
-        return f"SUM({_field_sql(project, metric, metric.expr or '')})"
-    if t == "avg":
-        return f"AVG({_field_sql(project, metric, metric.expr or '')})"
-    if t == "ratio":
-        mm = _metric_map(project)
-        num = mm[metric.numerator]
-        den = mm[metric.denominator]
-        return f"SAFE_DIVIDE({_agg_expr(project, num)}, NULLIF({_agg_expr(project, den)}, 0))"
-    raise ValueError(f"Unsupported metric type '{t}'.")
+        return f"SUM({field})"
+    return f"AVG({field})"
+
+
+def _time_column(project: ProjectSpec, plan: JoinPlan) -> str:
+    """The model's own time column, falling back to the dataset's."""
+    return (plan.model.time_column or "").strip() or project.dataset.time_column
 
 
-def _where_days(project: ProjectSpec, days: int) -> str:
-    time_col = _bq_ident(project.dataset.time_column)
+def _where_days(project: ProjectSpec, plan: JoinPlan, days: int) -> str:
+    time_col = _column_sql(plan, None, _time_column(project, plan))
     return f"DATE({time_col}) >= DATE_SUB(CURRENT_DATE(), INTERVAL {int(days)} DAY)"
 
 
 def compile_kpi_sql(project: ProjectSpec, metric_name: str, *, days: int) -> str:
     metric = _metric_map(project)[metric_name]
-    model = _get_model(project, metric.model)
+    plan = _plan(project, metric)
     return (
         "SELECT\n"
-        f"  {_agg_expr(project, metric)} AS value\n"
-        f"FROM {_bq_ident(model.primary_table)}\n"
-        f"WHERE {_where_days(project, days)}\n"
+        f"  {_agg_expr(project, plan, metric)} AS value\n"
+        f"FROM {_from_sql(plan)}\n"
+        f"WHERE {_where_days(project, plan, days)}\n"
     )
 
 
 def compile_trend_sql(project: ProjectSpec, metric_name: str, *, days: int) -> str:
     metric = _metric_map(project)[metric_name]
-    model = _get_model(project, metric.model)
+    plan = _plan(project, metric)
 
     grain = (project.dataset.default_grain or "day").lower()
     bq_grain = _GRAIN_TO_BQ.get(grain, "DAY")
 
-    time_col = _bq_ident(project.dataset.time_column)
+    time_col = _column_sql(plan, None, _time_column(project, plan))
     bucket = f"DATE_TRUNC(DATE({time_col}), {bq_grain})"
 
     return (
         "SELECT\n"
         f"  {bucket} AS date,\n"
-        f"  {_agg_expr(project, metric)} AS value\n"
-        f"FROM {_bq_ident(model.primary_table)}\n"
-        f"WHERE {_where_days(project, days)}\n"
+        f"  {_agg_expr(project, plan, metric)} AS value\n"
+        f"FROM {_from_sql(plan)}\n"
+        f"WHERE {_where_days(project, plan, days)}\n"
         "GROUP BY date\n"
         "ORDER BY date\n"
     )
@@ -104,17 +184,108 @@ def compile_breakdown_sql(
     limit: int = 20,
 ) -> str:
     metric = _metric_map(project)[metric_name]
-    model = _get_model(project, metric.model)
+    plan = _plan(project, metric, dims=[dim])
 
-    dim_col = _bq_ident(model.dimensions[dim].column)
+    dim_col = _field_sql(plan, f"dimensions.{dim}")
 
     return (
         "SELECT\n"
         f"  {dim_col} AS dim,\n"
-        f"  {_agg_expr(project, metric)} AS value\n"
-        f"FROM {_bq_ident(model.primary_table)}\n"
-        f"WHERE {_where_days(project, days)}\n"
+        f"  {_agg_expr(project, plan, metric)} AS value\n"
+        f"FROM {_from_sql(plan)}\n"
+        f"WHERE {_where_days(project, plan, days)}\n"
         "GROUP BY dim\n"
         "ORDER BY value DESC\n"
         f"LIMIT {int(limit)}\n"
     )
+
+
+def _sql_literal(v: Any) -> str:
+    if v is None:
+        return "NULL"
+    if isinstance(v, bool):
+        return "TRUE" if v else "FALSE"
+    if isinstance(v, (int, float)):
+        return repr(v)
+    if isinstance(v, datetime):
+        return f"TIMESTAMP '{v.isoformat()}'"
+    if isinstance(v, date):
+        return f"DATE '{v.isoformat()}'"
+    s = str(v).replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{s}'"
+
+
+def _filter_sql(plan: JoinPlan, f: FilterSpec) -> str:
+    col = _field_sql(plan, f"dimensions.{f.dimension}")
+    if f.op == "is_null":
+        return f"{col} IS NULL"
+    if f.op == "not_null":
+        return f"{col} IS NOT NULL"
+    if f.op in ("in", "not_in"):
+        values = ", ".join(_sql_literal(v) for v in f.value)
+        return f"{col} {'NOT IN' if f.op == 'not_in' else 'IN'} ({values})"
+    return f"{col} {_FILTER_OPS[f.op]} {_sql_literal(f.value)}"
+
+
+def compile_select_sql(
+    project: ProjectSpec,
+    metrics: Sequence[MetricSpec],
+    *,
+    dims: Sequence[str] = (),
+    grain: Optional[str] = None,
+    filters: Sequence[FilterSpec] = (),
+    days: Optional[int] = None,
+    order_by: Sequence[Tuple[str, bool]] = (),
+    limit: Optional[int] = None,
+) -> str:
+    """
+    One GROUP BY query computing several metrics of the same model.
+
+    Columns are named after the dimension, 'date' for the grain bucket and
+    the canonical metric name. order_by holds (column, descending) pairs.
+    """
+    model = metric_model(project, metrics[0])
+    for m in metrics[1:]:
+        if metric_model(project, m).name != model.name:
+            raise ValueError(f"Metrics '{metrics[0].name}' and '{m.name}' belong to different models.")
+
+    refs: List[str] = []
+    for m in metrics:
+        refs.extend(_metric_refs(project, m))
+    refs.extend(f"dimensions.{d}" for d in dims)
+    refs.extend(f"dimensions.{f.dimension}" for f in filters)
+    plan = plan_joins(model, refs)
+
+    select: List[str] = []
+    group: List[str] = []
+    if grain:
+        time_col = _column_sql(plan, None, _time_column(project, plan))
+        bucket = f"DATE_TRUNC(DATE({time_col}), {_GRAIN_TO_BQ[grain]})"
+        select.append(f"{bucket} AS date")
+        group.append("date")
+    for d in dims:
+        select.append(f"{_field_sql(plan, f'dimensions.{d}')} AS {_bq_ident(d)}")
+        group.append(_bq_ident(d))
+    for m in metrics:
+        select.append(f"{_agg_expr(project, plan, m)} AS {_bq_ident(m.name)}")
+
+    where: List[str] = []
+    if days is not None:
+        where.append(_where_days(project, plan, days))
+    where.extend(_filter_sql(plan, f) for f in filters)
+
+    sql = "SELECT\n" + ",\n".join(f"  {c}" for c in select) + "\n"
+    sql += f"FROM {_from_sql(plan)}\n"
+    if where:
+        sql += "WHERE " + "\n  AND ".join(where) + "\n"
+    if group:
+        sql += f"GROUP BY {', '.join(group)}\n"
+    if order_by:
+        # NULLs last either way, matching query._sort_rows.
+        keys = ", ".join(
+            f"{c if c == 'date' else _bq_ident(c)}{' DESC' if desc else ' NULLS LAST'}" for c, desc in order_by
+        )
+        sql += f"ORDER BY {keys}\n"
+    if limit is not None:
+        sql += f"LIMIT {int(limit)}\n"
+    return sql
@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
+from core.compiler.joins import join_path
 from core.schema.project import ProjectSpec
 
 
@@ -236,4 +237,44 @@ def validate_project(project: ProjectSpec) -> List[ValidationIssue]:
                     )
                 )
 
+    # --- New: Rule 6: join graph validation ---
+    for model in project.models:
+        join_names: Dict[str, int] = {}
+        for j in model.joins:
+            join_names[j.name] = join_names.get(j.name, 0) + 1
+        for name, count in join_names.items():
+            if count > 1:
+                issues.append(
+                    ValidationIssue(
+                        level="ERROR",
+                        message=f"Model '{model.name}' defines join '{name}' {count} times. Join names must be unique.",
+                    )
+                )
+            if name == model.name:
+                issues.append(
+                    ValidationIssue(
+                        level="ERROR",
+                        message=f"Join '{name}' in model '{model.name}' must not reuse the model name (it aliases the primary table).",
+                    )
+                )
+
+        for j in model.joins:
+            try:
+                join_path(model, j.name)
+            except ValueError as e:
+                issues.append(ValidationIssue(level="ERROR", message=str(e)))
+
+        for ns, fields in (("dimensions", model.dimensions), ("measures", model.measures)):
+            for field_name, f in fields.items():
+                if f.join and f.join not in join_names:
+                    issues.append(
+                        ValidationIssue(
+                            level="ERROR",
+                            message=(
+                                f"Model '{model.name}' field {ns}.{field_name} references join '{f.join}' which is not defined.\n"
+                                f"Defined joins: {sorted(join_names.keys())}"
+                            ),
+                        )
+                    )
+
     return issues
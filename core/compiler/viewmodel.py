@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, get_args
+
+from core.compiler.query import Row, Runner, execute_plan, plan_queries
+from core.compiler.sql import resolve_metric
+from core.schema.project import ProjectSpec
+from core.schema.query import FilterSpec, Grain, QuerySpec
+
+# Render order: KPI tiles first, then the slower grouped views.
+VIEW_PRIORITY = {"kpi": 0, "trend": 1, "breakdown": 2}
+
+
+@dataclass(eq=False)
+class View:
+    """
+    One renderable view (a KPI tile, trend line or breakdown bar chart).
+
+    Holds the semantic query but no data until it is fetched through its
+    DataSource; data is fetched once and reused until it is invalidated or
+    older than the source's ttl.
+    """
+    kind: str
+    metric: str
+    title: str
+    format: Optional[str]
+    query: QuerySpec
+    dimension: Optional[str] = None
+    source: Optional["DataSource"] = field(default=None, repr=False)
+    _rows: Optional[List[Row]] = field(default=None, init=False, repr=False)
+    _fetched_at: float = field(default=0.0, init=False, repr=False)
+    # Bumped by DataSource.invalidate(); fetches started before a bump
+    # discard their rows.
+    _generation: int = field(default=0, init=False, repr=False)
+
+    @property
+    def priority(self) -> int:
+        return VIEW_PRIORITY[self.kind]
+
+    @property
+    def loaded(self) -> bool:
+        if self._rows is None:
+            return False
+        ttl = self.source.ttl if self.source is not None else None
+        return ttl is None or time.monotonic() - self._fetched_at < ttl
+
+    def data(self) -> List[Row]:
+        if not self.loaded:
+            if self.source is None:
+                raise ValueError(f"View '{self.kind}:{self.metric}' has no data source.")
+            self.source.fetch([self])
+        return self._rows or []
+
+    @property
+    def value(self) -> Any:
+        """Scalar for KPI views (None if the query returned no rows)."""
+        rows = self.data()
+        return rows[0].get(self.metric) if rows else None
+
+    def points(self) -> List[Tuple[Any, Any]]:
+        """(x, y) pairs for trend (x=date) and breakdown (x=dimension) views."""
+        x = "date" if self.kind == "trend" else self.dimension
+        return [(r.get(x), r.get(self.metric)) for r in self.data()]
+
+
+def format_value(value: Any, fmt: Optional[str]) -> str:
+    """Display string for a metric value given MetricSpec.format."""
+    if value is None:
+        return "–"
+    if fmt == "percent":
+        return f"{float(value):.1%}"
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value)
+
+
+class DataSource:
+    """
+    Fetches view data through a Runner.
+
+    Views passed together are planned as one batch, so views sharing a
+    model and shape (e.g. two KPI tiles, or all breakdowns by one
+    dimension) share one warehouse statement. With a ttl (seconds),
+    fetched data expires and is re-queried on next use.
+    """
+
+    def __init__(self, project: ProjectSpec, run: Runner, *, ttl: Optional[float] = None):
+        self.project = project
+        self.run = run
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._inflight: Dict[int, threading.Event] = {}
+
+    def fetch(self, views: Sequence[View]) -> None:
+        # Claim unloaded views under the lock, query outside it. Views
+        # another thread is already fetching are waited on, not re-queried,
+        # so concurrent renderer callbacks never run the same view twice.
+        done = threading.Event()
+        with self._lock:
+            mine = [v for v in views if not v.loaded and id(v) not in self._inflight]
+            waits = {id(e): e for e in (self._inflight.get(id(v)) for v in views) if e is not None}
+            for v in mine:
+                self._inflight[id(v)] = done
+            generations = [v._generation for v in mine]
+
+        try:
+            if mine:
+                plan = plan_queries(self.project, [v.query for v in mine])
+                results = execute_plan(plan, self.run)
+                fetched_at = time.monotonic()
+                with self._lock:
+                    for v, gen, rows in zip(mine, generations, results):
+                        # Invalidated mid-flight: these rows predate the refresh.
+                        if v._generation == gen:
+                            v._rows = rows
+                            v._fetched_at = fetched_at
+        finally:
+            with self._lock:
+                for v in mine:
+                    self._inflight.pop(id(v), None)
+            done.set()
+
+        for e in waits.values():
+            e.wait()
+        # Another thread's fetch may have failed, or a fetch (ours or
+        # theirs) was invalidated mid-flight; fetch those views again.
+        stale = [v for v in views if not v.loaded]
+        if stale:
+            self.fetch(stale)
+
+    def invalidate(self, views: Sequence[View]) -> None:
+        """
+        Drop fetched data so the next fetch re-queries these views.
+
+        Fetches already in flight for these views discard their results,
+        so callers never get rows queried before the invalidation.
+        """
+        with self._lock:
+            for v in views:
+                v._rows = None
+                v._generation += 1
+
+
+@dataclass
+class PageViewModel:
+    name: str
+    views: List[View]
+    source: DataSource = field(repr=False)
+
+    def views_of(self, *kinds: str) -> List[View]:
+        return [v for v in self.views if v.kind in kinds]
+
+    def tiers(self) -> List[List[View]]:
+        """Views grouped by priority, fastest first."""
+        by_priority: Dict[int, List[View]] = {}
+        for v in self.views:
+            by_priority.setdefault(v.priority, []).append(v)
+        return [by_priority[p] for p in sorted(by_priority)]
+
+    def fetch(self, views: Optional[Sequence[View]] = None) -> None:
+        self.source.fetch(self.views if views is None else views)
+
+    def refresh(self, views: Optional[Sequence[View]] = None) -> None:
+        """Invalidate the page (or some of its views); data is re-fetched on next use."""
+        self.source.invalidate(self.views if views is None else views)
+
+    def load(self) -> Iterator[List[View]]:
+        """
+        Progressively fetch the page, one tier at a time.
+
+        Yields each tier once its data is in, so KPI tiles can be drawn
+        before trend and breakdown queries have run.
+        """
+        for tier in self.tiers():
+            self.source.fetch(tier)
+            yield tier
+
+
+@dataclass
+class DashboardViewModel:
+    title: str
+    pages: List[PageViewModel]
+
+    def page(self, name: str) -> PageViewModel:
+        for p in self.pages:
+            if p.name == name:
+                return p
+        raise ValueError(f"Unknown page '{name}'.")
+
+
+def build_view_model(
+    project: ProjectSpec,
+    run: Runner,
+    *,
+    days: int = 30,
+    filters: Sequence[FilterSpec] = (),
+    breakdown_limit: int = 20,
+    ttl: Optional[float] = None,
+) -> DashboardViewModel:
+    """
+    Turn project.dashboard into a renderer-agnostic view model.
+
+    Building runs no queries; data is fetched when a page is loaded or a
+    view's data() is first read, so pages nobody opens cost nothing.
+    Pass ttl (seconds) for long-lived view models shared across sessions.
+    """
+    source = DataSource(project, run, ttl=ttl)
+    common: Dict[str, Any] = {"days": days, "filters": list(filters)}
+
+    pages: List[PageViewModel] = []
+    for page in project.dashboard.pages:
+        for kind in page.views:
+            if kind not in VIEW_PRIORITY:
+                raise ValueError(f"Page '{page.name}' has unsupported view '{kind}'.")
+
+        grain: Optional[str] = None
+        if "trend" in page.views:
+            grain = (project.dataset.default_grain or "day").lower()
+            if grain not in get_args(Grain):
+                raise ValueError(
+                    f"Page '{page.name}' has a trend view but dataset.default_grain '{grain}' is unsupported. "
+                    f"Supported grains: {list(get_args(Grain))}"
+                )
+
+        views: List[View] = []
+        for name in page.include_metrics:
+            metric = resolve_metric(project, name)
+            meta: Dict[str, Any] = {
+                "metric": name,
+                "title": metric.description or metric.name,
+                "format": metric.format,
+                "source": source,
+            }
+            if "kpi" in page.views:
+                views.append(View(kind="kpi", query=QuerySpec(metrics=[name], **common), **meta))
+            if "trend" in page.views:
+                views.append(View(kind="trend", query=QuerySpec(metrics=[name], grain=grain, **common), **meta))
+            if "breakdown" in page.views:
+                for dim in page.breakdown_dims:
+                    q = QuerySpec(
+                        metrics=[name],
+                        dimensions=[dim],
+                        order_by=[f"-{name}"],
+                        limit=breakdown_limit,
+                        **common,
+                    )
+                    views.append(View(kind="breakdown", dimension=dim, query=q, **meta))
+
+        pages.append(PageViewModel(name=page.name, views=views, source=source))
+
+    return DashboardViewModel(title=project.dashboard.title, pages=pages)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import Dict, Literal, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
 
 FieldType = Literal["string", "int", "float", "bool", "date", "timestamp"]
+JoinRelationship = Literal["many_to_one", "one_to_one", "one_to_many"]
+JoinType = Literal["left", "inner"]
 
 
 class FieldRefSpec(BaseModel):
@@ -13,17 +15,41 @@ class FieldRefSpec(BaseModel):
     type: FieldType = "string"
     description: Optional[str] = None
 
+    # Which joined table the column lives on (None = the model's primary table)
+    join: Optional[str] = None
+
+
+class JoinSpec(BaseModel):
+    """
+    A table joined onto the model's primary table (or onto another join).
+
+    keys maps parent columns -> joined table columns, e.g. {customer_id: id}.
+    relationship is the cardinality seen from the parent: many_to_one joins
+    never multiply parent rows, one_to_many joins do (fan-out). Note that a
+    many_to_one join still repeats the joined table's rows, once per parent
+    row sharing the key, so its measures cannot be summed at parent grain.
+    """
+    name: str = Field(..., min_length=1, pattern=r"^[a-zA-Z][a-zA-Z0-9_]*$")
+    table: str = Field(..., min_length=1)
+    parent: Optional[str] = None
+    keys: Dict[str, str] = Field(..., min_length=1)
+    relationship: JoinRelationship = "many_to_one"
+    how: JoinType = "left"
+
 
 class ModelSpec(BaseModel):
     """
     Semantic model mapping BI-friendly names -> physical columns.
 
-    MVP: single-table model.
+    A model has one primary table plus optional joins. The compiler only
+    emits the joins a query actually needs (see core.compiler.joins).
     """
     name: str = Field(..., min_length=1)
     primary_table: str = Field(..., min_length=1)
     primary_key: Optional[str] = None
     time_column: Optional[str] = None
 
+    joins: List[JoinSpec] = Field(default_factory=list)
+
     dimensions: Dict[str, FieldRefSpec] = Field(default_factory=dict)
     measures: Dict[str, FieldRefSpec] = Field(default_factory=dict)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Any, List, Literal, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+Grain = Literal["day", "week", "month", "quarter", "year"]
+FilterOp = Literal["eq", "ne", "gt", "gte", "lt", "lte", "in", "not_in", "is_null", "not_null"]
+
+
+class FilterSpec(BaseModel):
+    dimension: str = Field(..., min_length=1)
+    op: FilterOp = "eq"
+    value: Any = None
+
+    @model_validator(mode="after")
+    def _value_shape(self) -> "FilterSpec":
+        if self.op in ("in", "not_in"):
+            if not isinstance(self.value, (list, tuple)) or not self.value:
+                raise ValueError(f"filter op '{self.op}' needs a non-empty list value")
+        elif self.op not in ("is_null", "not_null") and self.value is None:
+            raise ValueError(f"filter op '{self.op}' needs a value (use is_null for NULL checks)")
+        return self
+
+
+class QuerySpec(BaseModel):
+    """
+    Ad-hoc semantic query: metrics x dimensions x grain, filtered and ordered.
+
+    metrics may be names or aliases. order_by entries name a metric (as
+    requested), a dimension or 'date'; prefix with '-' for descending.
+    """
+    metrics: List[str] = Field(..., min_length=1)
+    dimensions: List[str] = Field(default_factory=list)
+    grain: Optional[Grain] = None
+    days: Optional[int] = Field(None, ge=1)
+    filters: List[FilterSpec] = Field(default_factory=list)
+    order_by: List[str] = Field(default_factory=list)
+    limit: Optional[int] = Field(None, ge=1)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from core.compiler.viewmodel import DashboardViewModel, View, format_value
+
+
+def _import_dash() -> Any:
+    try:
+        import dash
+    except ImportError as e:
+        raise ImportError("The dash renderer needs dash: pip install 'symantica[dash]'") from e
+    return dash
+
+
+def _figure(view: View) -> Dict[str, Any]:
+    points = view.points()
+    trace = {
+        "x": [x for x, _ in points],
+        "y": [y for _, y in points],
+        "type": "scatter" if view.kind == "trend" else "bar",
+    }
+    title = f"{view.title} over time" if view.kind == "trend" else f"{view.title} by {view.dimension}"
+    return {"data": [trace], "layout": {"title": {"text": title}}}
+
+
+def build_app(vm: DashboardViewModel, *, name: str = __name__) -> Any:
+    """
+    Build a dash app for a view model.
+
+    Each page is a tab and is only queried when selected. KPI tiles and
+    charts are filled by separate callbacks, so tiles appear as soon as
+    their (cheaper) query returns. The Refresh button re-queries the
+    current page; build `vm` with a ttl to also expire data on its own,
+    since one view model serves every session.
+    """
+    dash = _import_dash()
+    from dash import Input, Output, callback_context, dcc, html
+
+    app = dash.Dash(name)
+    app.layout = html.Div(
+        [
+            html.H1(vm.title),
+            html.Button("Refresh", id="refresh", n_clicks=0),
+            dcc.Tabs(
+                id="page",
+                value=vm.pages[0].name,
+                children=[dcc.Tab(label=p.name, value=p.name) for p in vm.pages],
+            ),
+            dcc.Loading(html.Div(id="kpis", style={"display": "flex", "gap": "2em"})),
+            dcc.Loading(html.Div(id="charts")),
+        ]
+    )
+
+    def _refreshing() -> bool:
+        return any(t["prop_id"].startswith("refresh.") for t in callback_context.triggered)
+
+    @app.callback(Output("kpis", "children"), Input("page", "value"), Input("refresh", "n_clicks"))
+    def _kpis(page_name: str, _clicks: int) -> List[Any]:
+        page = vm.page(page_name)
+        views = page.views_of("kpi")
+        if _refreshing():
+            page.refresh(views)
+        page.fetch(views)
+        return [
+            html.Div([html.Div(v.title), html.H2(format_value(v.value, v.format))])
+            for v in views
+        ]
+
+    @app.callback(Output("charts", "children"), Input("page", "value"), Input("refresh", "n_clicks"))
+    def _charts(page_name: str, _clicks: int) -> List[Any]:
+        page = vm.page(page_name)
+        if _refreshing():
+            # Each callback invalidates only the views it renders.
+            page.refresh(page.views_of("trend", "breakdown"))
+        out: List[Any] = []
+        for tier in page.tiers():
+            if tier[0].kind == "kpi":
+                continue
+            page.fetch(tier)
+            out.extend(dcc.Graph(figure=_figure(v)) for v in tier)
+        return out
+
+    return app
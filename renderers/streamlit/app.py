@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Any
+
+from core.compiler.viewmodel import DashboardViewModel, View, format_value
+
+
+def _import_streamlit() -> Any:
+    try:
+        import streamlit as st
+    except ImportError as e:
+        raise ImportError("The streamlit renderer needs streamlit: pip install 'symantica[streamlit]'") from e
+    return st
+
+
+def _render_view(st: Any, view: View) -> None:
+    if view.kind == "kpi":
+        st.metric(view.title, format_value(view.value, view.format))
+        return
+
+    points = view.points()
+    data = {"x": [x for x, _ in points], view.metric: [y for _, y in points]}
+    if view.kind == "trend":
+        st.subheader(f"{view.title} over time")
+        st.line_chart(data, x="x", y=view.metric)
+    else:
+        st.subheader(f"{view.title} by {view.dimension}")
+        st.bar_chart(data, x="x", y=view.metric)
+
+
+def render(vm: DashboardViewModel) -> None:
+    """
+    Render the selected page of a view model in a streamlit script.
+
+    Only the selected page is queried. Tiers render as they arrive, so KPI
+    tiles show while trend/breakdown queries are still running. Keep `vm`
+    in st.session_state (or st.cache_resource) so fetched data survives
+    reruns.
+    """
+    st = _import_streamlit()
+
+    st.title(vm.title)
+    name = st.sidebar.radio("Page", [p.name for p in vm.pages])
+    page = vm.page(name)
+
+    for tier in page.load():
+        if tier[0].kind == "kpi":
+            for col, view in zip(st.columns(len(tier)), tier):
+                with col:
+                    _render_view(st, view)
+        else:
+            for view in tier:
+                _render_view(st, view)